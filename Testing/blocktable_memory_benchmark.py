@@ -0,0 +1,74 @@
+# Compare peak memory of the old list-of-dicts block format against BlockTable.
+# Usage: python Testing/blocktable_memory_benchmark.py [file.pdf] [copies]
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.block_table import BlockTable
+from src.pdf_reader import extract_text_blocks
+
+
+def fresh(text):
+    # New string object, as produced by PyMuPDF or the translation API.
+    return text.encode("utf-8").decode("utf-8")
+
+
+def legacy_pipeline(raw_blocks):
+    # Mirrors the three copies the app used to hold: block dicts,
+    # flattened texts and the per-page (block, translated text) grouping.
+    blocks = [
+        {'page': page, 'text': fresh(text), 'bbox': tuple(bbox), 'block_type': 0, 'block_no': i}
+        for i, (page, bbox, text) in enumerate(raw_blocks)
+    ]
+    texts = [b['text'].replace('\n', ' ') for b in blocks]
+    translated_texts = [fresh(t) for t in texts]
+    blocks_by_page = {}
+    for i, block in enumerate(blocks):
+        blocks_by_page.setdefault(block['page'], []).append((block, translated_texts[i]))
+    return blocks, texts, blocks_by_page
+
+
+def table_pipeline(raw_blocks):
+    table = BlockTable.from_columns(
+        [page for page, _, _ in raw_blocks],
+        [bbox for _, bbox, _ in raw_blocks],
+        [0] * len(raw_blocks),
+        list(range(len(raw_blocks))),
+        [fresh(text) for _, _, text in raw_blocks],
+    )
+    texts = [t.replace('\n', ' ') for t in table.texts()]
+    translated = table.with_texts(fresh(t) for t in texts)
+    return table, translated
+
+
+def measure(fn, *args):
+    tracemalloc.start()
+    result = fn(*args)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, retained, peak
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "sample_pdfs/Testing.pdf"
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    with open(path, "rb") as f:
+        base = extract_text_blocks(f.read())
+
+    # Replicate the document to simulate a large PDF.
+    page_count = int(base.page[-1]) + 1
+    raw_blocks = [
+        (int(base.page[i]) + c * page_count, base.bbox[i].tolist(), base.text(i))
+        for c in range(copies) for i in range(len(base))
+    ]
+    print(f"Blocks: {len(raw_blocks)}")
+
+    for name, fn in (("list-of-dicts", legacy_pipeline), ("BlockTable", table_pipeline)):
+        _, retained, peak = measure(fn, raw_blocks)
+        print(f"{name:14s} retained: {retained / 1024:9.1f} KB   peak: {peak / 1024:9.1f} KB")
+
+
+if __name__ == "__main__":
+    main()
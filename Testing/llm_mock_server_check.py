@@ -0,0 +1,98 @@
+# Runs the LLM backend against a local mock OpenAI-compatible server that
+# streams chat completions, including a dropped segment and a truncated
+# (finish_reason "length") answer to exercise retries. Devanagari is sent
+# unescaped on a charset-less text/event-stream, like many real servers do.
+# Usage: python Testing/llm_mock_server_check.py
+import os
+import re
+import sys
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+PHRASES = {"Hello world": "नमस्ते दुनिया"}
+
+
+class MockChatHandler(BaseHTTPRequestHandler):
+    requests_seen = 0
+    authorization = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        assert self.path == "/v1/chat/completions" and body["stream"] is True
+        MockChatHandler.requests_seen += 1
+        MockChatHandler.authorization.append(self.headers.get("Authorization"))
+        lines = re.findall(r"^(\d+)\. (.*)$", body["messages"][-1]["content"], re.M)
+        # "Translate" by upper-casing. Big batches silently drop segment 2
+        # and stop mid-way through the last line with finish_reason "length",
+        # as does any segment asking to be cut off.
+        truncate = len(lines) > 2 or any("cut me off" in text for _, text in lines)
+        answer = "\n".join(
+            f"{n}. {PHRASES.get(text, text.upper())}" for n, text in lines
+            if not (len(lines) > 2 and n == "2")
+        )
+        if truncate:
+            answer = answer[:len(answer) - len(lines[-1][1]) // 2]
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for i in range(0, len(answer), 7):
+            chunk = {"choices": [{"delta": {"content": answer[i:i + 7]}, "finish_reason": None}]}
+            self.wfile.write(f"data: {json.dumps(chunk, ensure_ascii=False)}\n\n".encode("utf-8"))
+        finish = {"choices": [{"delta": {}, "finish_reason": "length" if truncate else "stop"}]}
+        self.wfile.write(f"data: {json.dumps(finish)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def log_message(self, *args):
+        pass
+
+
+def main():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockChatHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    os.environ["LLM_BASE_URL"] = f"http://127.0.0.1:{server.server_port}/v1"
+    os.environ.pop("LLM_API_KEY", None)
+    os.environ["HF_TOKEN"] = "hf_should_not_leak"
+
+    from src.translator import translate_text_blocks
+
+    blocks = [
+        "Upload a PDF file to the NASA portal",
+        "यह पहले से हिंदी में है",
+        "Choose the translation direction",
+        "Download the translated document",
+    ]
+    partials = []
+    result = translate_text_blocks(blocks, 'en', 'hi', backend='llm', stream_callback=partials.append)
+    for original, translated in zip(blocks, result):
+        print(f"{original!r} -> {translated!r}")
+    print(f"Requests: {MockChatHandler.requests_seen}, streamed updates: {len(partials)}")
+    assert result[1] == blocks[1], "target-language block should be skipped"
+    assert "NASA" in result[0] and result[2].isupper() and result[3].isupper()
+    assert MockChatHandler.requests_seen == 3, "dropped and truncated segments should be retried"
+
+    # Unescaped UTF-8 without a charset must not be decoded as ISO-8859-1
+    assert translate_text_blocks(["Hello world"], 'en', 'hi', backend='llm') == ["नमस्ते दुनिया"]
+
+    # A segment longer than one batch is split, translated piecewise and rejoined
+    long_block = " ".join(["The quick brown fox jumps over the lazy dog."] * 80)
+    seen = MockChatHandler.requests_seen
+    long_result = translate_text_blocks([long_block], 'en', 'hi', backend='llm')[0]
+    print(f"Long block: {len(long_block)} chars in {MockChatHandler.requests_seen - seen} requests")
+    assert long_result == long_block.upper(), "every piece of a long block should be translated"
+
+    # A lone segment cut off at max_tokens keeps its partial translation
+    cut = translate_text_blocks(["Please cut me off somewhere"], 'en', 'hi', backend='llm')[0]
+    print(f"Truncated single segment -> {cut!r}")
+    assert cut.isupper() and cut != "Please cut me off somewhere"
+    server.shutdown()
+
+    assert not any(MockChatHandler.authorization), "HF_TOKEN must only be sent to the HF router"
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+# Compare output size and write time of the legacy paint-over writer against
+# the optimized redact + garbage-collect + compress writer.
+# Usage: python Testing/pdf_output_benchmark.py [file.pdf]
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.pdf_reader import extract_text_blocks
+from src.pdf_writer import create_translated_pdf
+
+
+def main():
+    path = sys.argv[1] if len(sys.argv) > 1 else "sample_pdfs/Testing.pdf"
+    with open(path, "rb") as f:
+        original = f.read()
+    blocks = extract_text_blocks(original)
+    # Stand-in translation so the benchmark needs no API access.
+    translated = blocks.with_texts(t.upper() for t in blocks.texts())
+
+    print(f"Input: {len(original) / 1024:.1f} KB")
+    for label, optimize in (("legacy", False), ("optimized", True)):
+        stats = {}
+        create_translated_pdf(original, translated, optimize=optimize, stats=stats)
+        print(f"{label:10s} size: {stats['output_bytes'] / 1024:9.1f} KB   "
+              f"render: {stats['render_seconds']:.3f}s   write: {stats['write_seconds']:.3f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+# Compare the old translate-then-render barrier against the pipelined
+# scheduler, using a stand-in translation API with fixed network latency.
+# Usage: python Testing/pipeline_benchmark.py [file.pdf] [copies] [latency_s]
+import os
+import sys
+import time
+import types
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pymupdf as fitz
+import src.translator as translator
+from src.pdf_reader import extract_text_blocks
+from src.pdf_writer import create_translated_pdf
+from src.pipeline import translate_and_render_pdf
+
+
+def fake_api(text, source, target):
+    time.sleep(LATENCY)
+    return text.upper()
+
+
+def replicate(path, copies):
+    src = fitz.open(path)
+    doc = fitz.open()
+    for _ in range(copies):
+        doc.insert_pdf(src)
+    data = doc.tobytes()
+    doc.close()
+    src.close()
+    return data
+
+
+def barrier(original, blocks):
+    texts = [t.replace('\n', ' ') for t in blocks.texts()]
+    translated = blocks.with_texts(translator.translate_text_blocks(texts, 'en', 'hi'))
+    return create_translated_pdf(original, translated)
+
+
+def main():
+    global LATENCY
+    path = sys.argv[1] if len(sys.argv) > 1 else "sample_pdfs/Testing.pdf"
+    copies = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    LATENCY = float(sys.argv[3]) if len(sys.argv) > 3 else 0.005
+    translator.translate_text_via_api = fake_api
+    # Drop the inter-block pacing so the stand-in latency is the only network cost
+    translator.time = types.SimpleNamespace(sleep=lambda seconds: None)
+
+    original = replicate(path, copies)
+    blocks = extract_text_blocks(original)
+
+    start = time.perf_counter()
+    barrier(original, blocks)
+    print(f"barrier:              {time.perf_counter() - start:.2f}s")
+    for workers in (1, 2):
+        stats = {}
+        start = time.perf_counter()
+        translate_and_render_pdf(original, blocks, 'en', 'hi', workers=workers, stats=stats)
+        print(f"pipelined, {workers} worker(s): {time.perf_counter() - start:.2f}s "
+              f"(render {stats['render_seconds']:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,18 +2,20 @@ import streamlit as st
 
 # Import flat functions
 from src.config import (
-    TRANSLATION_DIRECTIONS, MAX_FILE_SIZE_MB,
+    TRANSLATION_DIRECTIONS, AUTO_DETECT_DIRECTION, TRANSLATION_BACKENDS, MAX_FILE_SIZE_MB,
+    OPTIMIZE_OUTPUT_PDF, LINEARIZE_OUTPUT_PDF,
     ERROR_MESSAGES, SUCCESS_MESSAGES
 )
 from src.pdf_reader import (
     validate_pdf, get_pdf_info, has_extractable_text,
     extract_text_blocks
 )
-from src.translator import translate_text, translate_text_blocks
+from src.translator import translate_text, detect_translation_direction
+from src.pipeline import translate_and_render_pdf
 
-from src.pdf_writer import (
-    create_translated_pdf, create_simple_translated_pdf
-)
+from src.glossary import get_glossary, list_glossary_projects
+
+from src.pdf_writer import create_simple_translated_pdf, linearization_supported
 
 def render_sidebar():
     with st.sidebar:
@@ -25,9 +27,14 @@ def render_sidebar():
 
         demo_text = st.text_input("Try intelligent filtering:", value="You are free to use any open-source LLM model or translation API")
         if demo_text:
-            translated = translate_text(demo_text, source_demo, target_demo)
+            translated = translate_text(demo_text, source_demo, target_demo, get_glossary(st.session_state.get("glossary_project")))
             st.markdown(f"**Translated Result:** {translated}")
 
+        st.header("📚 Glossary")
+        # Term files are re-read whenever they change on disk
+        project = st.selectbox("Glossary project", list_glossary_projects(), key="glossary_project")
+        st.caption(f"{get_glossary(project).term_count()} terms loaded")
+
 
 
 # Render MAIN FIle
@@ -65,7 +72,11 @@ def render_file_upload():
 
 def render_translation_direction():
     st.header("2️⃣ Select Translation Direction")
-    direction = st.selectbox("Direction:", list(TRANSLATION_DIRECTIONS.keys()), index=1)
+    options = [AUTO_DETECT_DIRECTION] + list(TRANSLATION_DIRECTIONS.keys())
+    direction = st.selectbox("Direction:", options, index=2)
+    if direction == AUTO_DETECT_DIRECTION:
+        st.info("Direction will be detected from the document's script")
+        return None, None
     source_lang, target_lang = TRANSLATION_DIRECTIONS[direction]
     col1, col2 = st.columns(2)
     col1.info(f"From: {direction.split(' to ')[0]}")
@@ -74,37 +85,60 @@ def render_translation_direction():
 
 def run_translation(uploaded_file, source_lang, target_lang):
     st.header("3️⃣ Translate PDF")
+    backend = TRANSLATION_BACKENDS[st.selectbox("Translation engine:", list(TRANSLATION_BACKENDS.keys()))]
+    col1, col2 = st.columns(2)
+    optimize = col1.checkbox(
+        "Optimize output size", value=OPTIMIZE_OUTPUT_PDF,
+        help="Removes the original text instead of covering it and compresses the file. "
+             "Turn off to keep the original under a toggleable \"Translated\" layer."
+    )
+    linearize = False
+    if linearization_supported():  # not available in newer MuPDF builds
+        linearize = col2.checkbox("Linearize for fast web view", value=LINEARIZE_OUTPUT_PDF, disabled=not optimize)
     if st.button("🚀 Start Translation"):
         progress = st.progress(0.0)
         status = st.empty()
+        preview = st.empty()
 
         file_bytes = uploaded_file.getvalue()
         status.text("📖 Extracting text...")
         progress.progress(0.1)
         blocks = extract_text_blocks(file_bytes)
 
-        if not blocks:
+        if not len(blocks):
             st.error("No text blocks found. May be image-only.")
             return None
 
         # Extract and flatten text (remove line breaks)
-        texts = [b['text'].replace('\n', ' ') for b in blocks]
+        texts = [t.replace('\n', ' ') for t in blocks.texts()]
+
+        if source_lang is None:
+            source_lang, target_lang = detect_translation_direction(texts)
+            status.text(f"🔍 Detected direction: {source_lang} → {target_lang}")
+        char_count = sum(len(t) for t in texts)
+        del texts
 
         def callback(p, msg):  # Progress updater
-            progress.progress(0.3 + p * 0.5)
+            progress.progress(0.3 + p * 0.65)
             status.text(f"🔄 {msg}")
 
-        status.text("🔄 Translating...")
-        translated = translate_text_blocks(texts, source_lang, target_lang, callback)
-
-
-        progress.progress(0.85)
-        status.text("📄 Generating PDF...")
-        pdf_bytes = create_translated_pdf(file_bytes, blocks, translated)
+        def stream_callback(partial):  # Live LLM output
+            preview.text(partial[-800:])
+
+        # Pages are rendered as soon as they are translated
+        status.text("🔄 Translating and rendering...")
+        glossary = get_glossary(st.session_state.get("glossary_project"))
+        write_stats = {}
+        pdf_bytes, translated = translate_and_render_pdf(
+            file_bytes, blocks, source_lang, target_lang, callback,
+            backend=backend, stream_callback=stream_callback, glossary=glossary,
+            optimize=optimize, linearize=linearize, stats=write_stats
+        )
+        preview.empty()
 
         if not pdf_bytes:
             status.text("📄 Using fallback layout...")
-            combined_text = "\n".join(translated)
+            combined_text = "\n".join(translated.texts())
             pdf_bytes = create_simple_translated_pdf(combined_text, file_bytes)
 
         progress.progress(1.0)
@@ -115,10 +149,19 @@ def run_translation(uploaded_file, source_lang, target_lang):
         st.session_state.original_filename = uploaded_file.name
 
         st.success(SUCCESS_MESSAGES["translation_complete"])
-        col1, col2, col3 = st.columns(3)
+        col1, col2, col3, col4 = st.columns(4)
         col1.metric("Blocks", len(blocks))
-        col2.metric("Characters", sum(len(t) for t in texts))
-        col3.metric("Size", f"{len(pdf_bytes) // 1024} KB")
+        col2.metric("Characters", char_count)
+        col3.metric(
+            "Size", f"{len(pdf_bytes) // 1024} KB",
+            delta=f"{(len(pdf_bytes) - len(file_bytes)) // 1024} KB vs input",
+            delta_color="inverse"
+        )
+        if write_stats:
+            col4.metric(
+                "Render / Write",
+                f"{write_stats['render_seconds']:.2f}s / {write_stats['write_seconds']:.2f}s"
+            )
 
 def render_download_section():
     if st.session_state.get("translation_complete"):
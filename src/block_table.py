@@ -0,0 +1,80 @@
+import numpy as np
+from typing import Iterable, Iterator, List, Tuple
+
+# Columnar store for extracted text blocks. Geometry lives in NumPy arrays and
+# all block texts share one UTF-8 byte pool addressed by offsets, so a document
+# is held once instead of as a list of per-block dicts. UTF-8 keeps the pool
+# compact even when a single emoji would widen a joined str to 4 bytes/char.
+class BlockTable:
+    def __init__(self, page: np.ndarray, bbox: np.ndarray, block_type: np.ndarray,
+                 block_no: np.ndarray, text_pool: bytes, offsets: np.ndarray):
+        self.page = page
+        self.bbox = bbox
+        self.block_type = block_type
+        self.block_no = block_no
+        self.text_pool = text_pool
+        self.offsets = offsets
+
+    @staticmethod
+    def pack_texts(texts: Iterable[str]) -> Tuple[bytes, np.ndarray]:
+        encoded = [t.encode("utf-8", errors="surrogatepass") for t in texts]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(e) for e in encoded], out=offsets[1:])
+        return b"".join(encoded), offsets
+
+    @classmethod
+    def from_columns(cls, pages: List[int], bboxes: List[Tuple[float, float, float, float]],
+                     block_types: List[int], block_nos: List[int], texts: List[str]) -> "BlockTable":
+        text_pool, offsets = cls.pack_texts(texts)
+        return cls(
+            page=np.asarray(pages, dtype=np.int32),
+            bbox=np.asarray(bboxes, dtype=np.float32).reshape(-1, 4),
+            block_type=np.asarray(block_types, dtype=np.int8),
+            block_no=np.asarray(block_nos, dtype=np.int32),
+            text_pool=text_pool,
+            offsets=offsets,
+        )
+
+    def __len__(self) -> int:
+        return len(self.page)
+
+    def text(self, i: int) -> str:
+        return self.text_pool[self.offsets[i]:self.offsets[i + 1]].decode("utf-8", errors="surrogatepass")
+
+    def texts(self, start: int = 0, stop: int = None) -> List[str]:
+        stop = len(self) if stop is None else stop
+        bounds = self.offsets[start:stop + 1].tolist()
+        pool = self.text_pool
+        return [pool[a:b].decode("utf-8", errors="surrogatepass") for a, b in zip(bounds, bounds[1:])]
+
+    # Geometry arrays are shared; only the text pool and offsets are new.
+    def with_texts(self, texts: Iterable[str]) -> "BlockTable":
+        text_pool, offsets = self.pack_texts(texts)
+        if len(offsets) - 1 != len(self):
+            raise ValueError(f"Expected {len(self)} texts, got {len(offsets) - 1}")
+        return BlockTable(self.page, self.bbox, self.block_type, self.block_no,
+                          text_pool, offsets)
+
+    # Like with_texts, but from (pool, offsets) chunks made by pack_texts for
+    # consecutive row ranges, so callers never hold every text as a str.
+    def with_packed_texts(self, chunks: List[Tuple[bytes, np.ndarray]]) -> "BlockTable":
+        pools, offsets, base = [], [np.zeros(1, dtype=np.int64)], 0
+        for pool, chunk_offsets in chunks:
+            pools.append(pool)
+            offsets.append(chunk_offsets[1:] + base)
+            base += len(pool)
+        offsets = np.concatenate(offsets)
+        if len(offsets) - 1 != len(self):
+            raise ValueError(f"Expected {len(self)} texts, got {len(offsets) - 1}")
+        return BlockTable(self.page, self.bbox, self.block_type, self.block_no,
+                          b"".join(pools), offsets)
+
+    def iter_pages(self) -> Iterator[Tuple[int, int, int]]:
+        if not len(self):
+            return
+        # Row indices where the page number changes mark page boundaries.
+        cuts = np.flatnonzero(np.diff(self.page)) + 1
+        starts = np.concatenate(([0], cuts)).tolist()
+        stops = np.concatenate((cuts, [len(self)])).tolist()
+        for start, stop in zip(starts, stops):
+            yield int(self.page[start]), start, stop
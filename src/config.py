@@ -10,10 +10,33 @@ TRANSLATION_DIRECTIONS = {
     'English to Hindi': ('en', 'hi')
 }
 
+# Translation backends (label -> backend key used by translate_text_blocks)
+TRANSLATION_BACKENDS = {
+    'mBART-50 (Hugging Face API)': 'mbart',
+    'Llama 3.1 8B (OpenAI-compatible LLM)': 'llm'
+}
+
+# Direction option that picks source/target from the document's script
+AUTO_DETECT_DIRECTION = 'Auto Detect'
+
 # File upload settings
 MAX_FILE_SIZE_MB = 10
 ALLOWED_EXTENSIONS = ['pdf']
 
+# Output PDF settings
+OPTIMIZE_OUTPUT_PDF = True     # redact originals, garbage-collect and compress
+LINEARIZE_OUTPUT_PDF = False   # fast web view; only offered if the MuPDF build supports it
+
+# Translate/render pipeline: translation threads per backend and how many
+# translated pages may wait for the renderer before the translators block.
+# mBART stays single-threaded: its pacing is per thread and the hosted API
+# answers throttled requests with the untranslated source text.
+PIPELINE_TRANSLATE_WORKERS = {
+    'mbart': 1,
+    'llm': 2
+}
+PIPELINE_QUEUE_PAGES = 4
+
 # Error messages
 ERROR_MESSAGES = {
     'file_too_large': f'File size exceeds {MAX_FILE_SIZE_MB}MB limit',
@@ -0,0 +1,215 @@
+import os
+import re
+import csv
+import json
+import unicodedata
+from typing import Dict, List, Optional, Tuple
+
+# ========== Layout ==========
+# glossaries/<project>/<source>-<target>.json|.tsv|.csv  source term -> required target term
+# glossaries/<project>/<lang>-fixes.json                 target-side substitutions for <lang>
+GLOSSARY_DIR = "glossaries"
+DEFAULT_GLOSSARY_PROJECT = "default"
+MODERN_REPLACEMENTS_PATH = "src/modern_replacements.json"
+
+# preprocess_text splits placeholders out as their own skipped tokens (even
+# when punctuation touches them), so they are never sent to the API.
+TOKEN_FORMAT = "__G{}__"
+MASK_TOKEN = re.compile(r'__G\d+__')
+# Tolerates spacing/underscore damage from translation engines.
+TOKEN_PATTERN = re.compile(r'_{1,2}\s*G\s*(\d+)\s*_{1,2}')
+
+_TERMINAL = None
+
+def is_word_char(ch: str) -> bool:
+    # Devanagari vowel signs and viramas are combining marks, not alnum
+    return ch.isalnum() or ch == '_' or unicodedata.category(ch).startswith('M')
+
+# ========== Term Index ==========
+# Character trie matched leftmost-longest. Each scan from a start position
+# stops at the first missing child, so masking costs O(len(text) * longest
+# term) whatever the number of terms.
+class TermIndex:
+    def __init__(self, terms: Dict[str, str], whole_words: bool = True, ignore_case: bool = True):
+        self.whole_words = whole_words
+        self.ignore_case = ignore_case
+        self.root = {}
+        self.size = 0
+        for term, target in terms.items():
+            term = term.strip()
+            if not term:
+                continue
+            node = self.root
+            for ch in (term.lower() if ignore_case else term):
+                node = node.setdefault(ch, {})
+            node[_TERMINAL] = target
+            self.size += 1
+
+    def __len__(self) -> int:
+        return self.size
+
+    def find(self, text: str) -> List[Tuple[int, int, str]]:
+        haystack = text
+        if self.ignore_case:
+            lowered = text.lower()
+            if len(lowered) == len(text):
+                haystack = lowered
+            else:
+                # A few characters (e.g. "İ") grow when lowered; keep only
+                # those as-is so offsets still line up with `text`
+                haystack = "".join(ch.lower() if len(ch.lower()) == 1 else ch for ch in text)
+        matches = []
+        n = len(text)
+        i = 0
+        while i < n:
+            if self.whole_words and i > 0 and is_word_char(text[i - 1]):
+                i += 1
+                continue
+            node = self.root
+            j = i
+            best = None
+            while j < n:
+                node = node.get(haystack[j])
+                if node is None:
+                    break
+                j += 1
+                if _TERMINAL in node and (not self.whole_words or j == n or not is_word_char(text[j])):
+                    best = (j, node[_TERMINAL])
+            if best:
+                matches.append((i, best[0], best[1]))
+                i = best[0]
+            else:
+                i += 1
+        return matches
+
+    def replace(self, text: str) -> str:
+        pieces = []
+        last = 0
+        for start, end, target in self.find(text):
+            pieces.append(text[last:start])
+            pieces.append(target)
+            last = end
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+# ========== Glossary ==========
+class Glossary:
+    def __init__(self, terms: Dict[Tuple[str, str], Dict[str, str]], fixes: Dict[str, Dict[str, str]]):
+        self.term_indexes = {direction: TermIndex(t) for direction, t in terms.items()}
+        # Fixes keep the substring semantics of the old str.replace loop
+        self.fix_indexes = {
+            lang: TermIndex(f, whole_words=False, ignore_case=False) for lang, f in fixes.items()
+        }
+
+    def term_count(self) -> int:
+        return sum(len(index) for index in self.term_indexes.values())
+
+    def mask(self, text: str, source: str, target: str) -> Tuple[str, Dict[str, str]]:
+        index = self.term_indexes.get((source, target))
+        if not index:
+            return text, {}
+        pieces = []
+        replacements = {}
+        last = 0
+        for n, (start, end, term_target) in enumerate(index.find(text)):
+            token = TOKEN_FORMAT.format(n)
+            pieces.append(text[last:start])
+            pieces.append(token)
+            replacements[token] = term_target
+            last = end
+        if not pieces:
+            return text, {}
+        pieces.append(text[last:])
+        return "".join(pieces), replacements
+
+    # Fixes run first so the glossary's target terms are never rewritten.
+    def restore(self, text: str, replacements: Dict[str, str]) -> str:
+        if not replacements:
+            return text
+        return TOKEN_PATTERN.sub(
+            lambda m: replacements.get(TOKEN_FORMAT.format(m.group(1)), m.group(0)), text
+        )
+
+    def apply_fixes(self, text: str, target: str) -> str:
+        index = self.fix_indexes.get(target)
+        return index.replace(text) if index else text
+
+# ========== Loading ==========
+TERM_FILE = re.compile(r'^([a-z]{2})-([a-z]{2})\.(json|tsv|csv)$')
+FIXES_FILE = re.compile(r'^([a-z]{2})-fixes\.json$')
+
+def read_term_file(path: str) -> Dict[str, str]:
+    try:
+        if path.endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        delimiter = "\t" if path.endswith(".tsv") else ","
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            return {
+                row[0].strip(): row[1].strip()
+                for row in csv.reader(f, delimiter=delimiter)
+                if len(row) >= 2 and row[0].strip() and not row[0].startswith("#")
+            }
+    except Exception as e:
+        print(f"Could not load glossary file {path}:", e)
+        return {}
+
+def glossary_files(project: str) -> List[str]:
+    paths = [MODERN_REPLACEMENTS_PATH]
+    project_dir = os.path.join(GLOSSARY_DIR, project)
+    if os.path.isdir(project_dir):
+        paths += sorted(
+            os.path.join(project_dir, name) for name in os.listdir(project_dir)
+            if TERM_FILE.match(name) or FIXES_FILE.match(name)
+        )
+    return paths
+
+def load_glossary(project: str) -> Glossary:
+    terms: Dict[Tuple[str, str], Dict[str, str]] = {}
+    # The bundled modern replacements are the base Hindi fixes for every project
+    fixes: Dict[str, Dict[str, str]] = {'hi': read_term_file(MODERN_REPLACEMENTS_PATH)}
+    for path in glossary_files(project)[1:]:
+        name = os.path.basename(path)
+        term_match = TERM_FILE.match(name)
+        if term_match:
+            terms.setdefault((term_match.group(1), term_match.group(2)), {}).update(read_term_file(path))
+        else:
+            fixes.setdefault(FIXES_FILE.match(name).group(1), {}).update(read_term_file(path))
+    glossary = Glossary(terms, fixes)
+    print(f"Loaded glossary '{project}': {glossary.term_count()} terms")
+    return glossary
+
+def list_glossary_projects() -> List[str]:
+    projects = {DEFAULT_GLOSSARY_PROJECT}
+    if os.path.isdir(GLOSSARY_DIR):
+        projects.update(
+            name for name in os.listdir(GLOSSARY_DIR)
+            if os.path.isdir(os.path.join(GLOSSARY_DIR, name))
+        )
+    return sorted(projects)
+
+# Hot reload: a project is rebuilt whenever one of its files is added,
+# removed or modified, so edited term files apply without a restart.
+_glossary_cache: Dict[str, Tuple[tuple, Glossary]] = {}
+
+def _files_signature(paths: List[str]) -> tuple:
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+            signature.append((path, stat.st_mtime_ns, stat.st_size))
+        except OSError:
+            signature.append((path, None, None))
+    return tuple(signature)
+
+def get_glossary(project: Optional[str] = None) -> Glossary:
+    project = project or DEFAULT_GLOSSARY_PROJECT
+    signature = _files_signature(glossary_files(project))
+    cached = _glossary_cache.get(project)
+    if cached and cached[0] == signature:
+        return cached[1]
+    glossary = load_glossary(project)
+    _glossary_cache[project] = (signature, glossary)
+    return glossary
@@ -0,0 +1,236 @@
+import re
+import os
+import json
+import requests
+from urllib.parse import urlparse
+from typing import Callable, Iterator, List, Optional
+from dotenv import load_dotenv
+
+# ========== Setup ==========
+# Any OpenAI-compatible chat endpoint works: the Hugging Face router, or a
+# local llama.cpp / vLLM server (e.g. LLM_BASE_URL=http://localhost:8080/v1).
+load_dotenv()
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://router.huggingface.co/v1")
+LLM_MODEL = os.getenv("LLM_MODEL", "meta-llama/Llama-3.1-8B-Instruct")
+LLM_API_KEY = os.getenv("LLM_API_KEY")
+# HF_TOKEN is only a fallback for the Hugging Face router; never send it to
+# a third-party or self-hosted endpoint.
+HF_ROUTER_HOST = "router.huggingface.co"
+LLM_TIMEOUT = 120
+
+# Segments per prompt and a character cap so one request stays well inside
+# the model's context window. The cap keeps estimate_max_tokens below
+# LLM_MAX_TOKENS for a full batch: 64 + 2 * 1800 + 8 * 16 = 3792.
+LLM_BATCH_SIZE = 16
+LLM_BATCH_MAX_CHARS = 1800
+LLM_MAX_TOKENS = 4096
+# Longer segments are split at sentence (or word) boundaries before batching,
+# so a single segment can never outgrow its own token budget.
+LLM_SEGMENT_MAX_CHARS = LLM_BATCH_MAX_CHARS
+
+LANGUAGE_NAMES = {
+    'en': 'English',
+    'hi': 'Hindi'
+}
+
+# ========== Prompting ==========
+def build_batch_prompt(segments: List[str], source: str, target: str) -> List[dict]:
+    src_name = LANGUAGE_NAMES[source]
+    tgt_name = LANGUAGE_NAMES[target]
+    system = f"""You are a highly skilled {src_name}-to-{tgt_name} translator.
+
+Translate each numbered {src_name} segment into accurate, natural {tgt_name}.
+
+🚫 STRICT RULES:
+1. DO NOT translate or transliterate abbreviations or acronyms (e.g., AI, NASA, API, URL)
+2. DO NOT translate or transliterate FULLY CAPITALIZED words (e.g., PDF, HTML, FILE, SAVE, ML, JSON) — keep them **exactly** as written
+3. Keep placeholder tokens such as __AI__ exactly as written
+4. DO NOT modify formatting or punctuation
+5. Answer with one line per segment, in the same order, as "<number>. <translation>" — no extra notes"""
+    numbered = "\n".join(f"{i}. {' '.join(seg.split())}" for i, seg in enumerate(segments, 1))
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": numbered},
+    ]
+
+def estimate_max_tokens(segments: List[str]) -> int:
+    # Devanagari tokenizes far less efficiently than Latin text, so budget
+    # generously per character instead of a flat 2000 for every request.
+    chars = sum(len(seg) for seg in segments)
+    return min(LLM_MAX_TOKENS, 64 + 2 * chars + 8 * len(segments))
+
+NUMBERED_LINE = re.compile(r'^\s*[\[(]?(\d+)[\].):\-]\s*(.*)$')
+
+def parse_numbered_output(text: str, count: int) -> List[Optional[str]]:
+    results: List[Optional[str]] = [None] * count
+    current = None
+    for line in text.splitlines():
+        match = NUMBERED_LINE.match(line)
+        if match and 1 <= int(match.group(1)) <= count:
+            current = int(match.group(1)) - 1
+            results[current] = match.group(2).strip()
+        elif current is not None and line.strip():
+            # Model wrapped a long translation onto the next line
+            results[current] = f"{results[current]} {line.strip()}".strip()
+    # A single unnumbered answer is still usable for a one-segment batch
+    if count == 1 and results[0] is None and text.strip():
+        results[0] = text.strip()
+    # Drop echoed language labels such as "Hindi: ..."
+    for i, result in enumerate(results):
+        if result and result.split(":", 1)[0].strip() in LANGUAGE_NAMES.values():
+            results[i] = result.split(":", 1)[1].strip()
+    return results
+
+# ========== Transport ==========
+# Raised when generation stopped at max_tokens (finish_reason "length")
+class LLMOutputTruncated(RuntimeError):
+    pass
+
+def get_api_key(base_url: str) -> Optional[str]:
+    if LLM_API_KEY:
+        return LLM_API_KEY
+    if urlparse(base_url).hostname == HF_ROUTER_HOST:
+        return os.getenv("HF_TOKEN")
+    return None
+
+def stream_chat_completion(messages: List[dict], max_tokens: int,
+                           base_url: str = None, model: str = None) -> Iterator[str]:
+    base_url = base_url or LLM_BASE_URL
+    url = base_url.rstrip("/") + "/chat/completions"
+    headers = {"Content-Type": "application/json"}
+    api_key = get_api_key(base_url)
+    if api_key:
+        headers["Authorization"] = f"Bearer {api_key}"
+    payload = {
+        "model": model or LLM_MODEL,
+        "messages": messages,
+        "max_tokens": max_tokens,
+        "temperature": 0.2,
+        "stream": True,
+    }
+    with requests.post(url, headers=headers, json=payload, stream=True, timeout=LLM_TIMEOUT) as response:
+        if response.status_code != 200:
+            raise RuntimeError(f"LLM API error {response.status_code}: {response.text[:200]}")
+        # SSE is UTF-8 by spec; decode_unicode would fall back to ISO-8859-1
+        # when the server omits the charset and garble Devanagari.
+        for raw in response.iter_lines():
+            line = raw.decode("utf-8")
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            chunk = json.loads(data)
+            choices = chunk.get("choices") or []
+            if choices:
+                delta = choices[0].get("delta", {}).get("content")
+                if delta:
+                    yield delta
+                if choices[0].get("finish_reason") == "length":
+                    raise LLMOutputTruncated("LLM output hit max_tokens")
+
+# ========== Translation ==========
+SENTENCE_END = re.compile(r'(?<=[.!?।])\s+')
+
+def split_long_segment(segment: str, max_chars: int = LLM_SEGMENT_MAX_CHARS) -> List[str]:
+    if len(segment) <= max_chars:
+        return [segment]
+    pieces, current = [], ""
+    for sentence in SENTENCE_END.split(segment):
+        # A sentence that is too long on its own falls back to word boundaries
+        words = [sentence] if len(sentence) <= max_chars else sentence.split()
+        for word in words:
+            while len(word) > max_chars:
+                if current:
+                    pieces.append(current)
+                    current = ""
+                pieces.append(word[:max_chars])
+                word = word[max_chars:]
+            if current and len(current) + 1 + len(word) > max_chars:
+                pieces.append(current)
+                current = ""
+            current = f"{current} {word}" if current else word
+    if current:
+        pieces.append(current)
+    return pieces
+
+def make_batches(segments: List[str]) -> List[List[int]]:
+    batches, current, current_chars = [], [], 0
+    for i, seg in enumerate(segments):
+        if current and (len(current) >= LLM_BATCH_SIZE or current_chars + len(seg) > LLM_BATCH_MAX_CHARS):
+            batches.append(current)
+            current, current_chars = [], 0
+        current.append(i)
+        current_chars += len(seg)
+    if current:
+        batches.append(current)
+    return batches
+
+def translate_batch_llm(segments: List[str], source: str, target: str,
+                        stream_callback: Callable[[str], None] = None) -> List[Optional[str]]:
+    messages = build_batch_prompt(segments, source, target)
+    output = ""
+    truncated = False
+    try:
+        for token in stream_chat_completion(messages, estimate_max_tokens(segments)):
+            output += token
+            if stream_callback:
+                stream_callback(output)
+    except LLMOutputTruncated as e:
+        print("LLM translation truncated:", e)
+        truncated = True
+    results = parse_numbered_output(output, len(segments))
+    if truncated and len(segments) > 1:
+        # The last answer was cut off mid-sentence; drop it so it is retried.
+        # A lone segment has no smaller retry, so its partial answer is kept.
+        answered = [i for i, result in enumerate(results) if result]
+        if answered:
+            results[answered[-1]] = None
+    return results
+
+def translate_segments_llm(segments: List[str], source: str, target: str, callback=None,
+                           stream_callback: Callable[[str], None] = None) -> List[str]:
+    if source not in LANGUAGE_NAMES or target not in LANGUAGE_NAMES:
+        print(f"❌ Unsupported language pair: {source} → {target}")
+        return list(segments)
+    # Overlong segments are translated piecewise and joined back afterwards
+    owners, pieces = [], []
+    for n, segment in enumerate(segments):
+        for piece in split_long_segment(segment):
+            owners.append(n)
+            pieces.append(piece)
+    translated_pieces = translate_pieces_llm(pieces, source, target, callback, stream_callback)
+    joined: List[List[str]] = [[] for _ in segments]
+    for n, piece in zip(owners, translated_pieces):
+        joined[n].append(piece)
+    return [" ".join(parts) for parts in joined]
+
+def translate_pieces_llm(segments: List[str], source: str, target: str, callback=None,
+                         stream_callback: Callable[[str], None] = None) -> List[str]:
+    translated = list(segments)
+    batches = make_batches(segments)
+    for n, batch in enumerate(batches):
+        if callback:
+            callback((n + 1) / len(batches), f"Translating batch {n + 1} of {len(batches)} with LLM")
+        batch_segments = [segments[i] for i in batch]
+        try:
+            results = translate_batch_llm(batch_segments, source, target, stream_callback)
+        except Exception as e:
+            print("LLM translation error:", e)
+            continue
+        missing = [i for i, r in zip(batch, results) if not r]
+        for i, result in zip(batch, results):
+            if result:
+                translated[i] = result
+        if len(batch) == 1:
+            continue
+        # Retry segments the model dropped or merged, one at a time
+        for i in missing:
+            try:
+                result = translate_batch_llm([segments[i]], source, target, stream_callback)[0]
+            except Exception as e:
+                print("LLM translation error:", e)
+                continue
+            if result:
+                translated[i] = result
+    return translated
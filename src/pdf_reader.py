@@ -1,4 +1,5 @@
 import pymupdf as fitz
+from src.block_table import BlockTable
 
 def validate_pdf(file_bytes: bytes) -> bool:
     print("Validating PDF...")
@@ -6,24 +7,23 @@ def validate_pdf(file_bytes: bytes) -> bool:
     print("PDF is valid.")
     return True
 
-def extract_text_blocks(file_bytes: bytes):
+def extract_text_blocks(file_bytes: bytes) -> BlockTable:
     print("Extracting text blocks from PDF...")
     doc = fitz.open(stream=file_bytes, filetype="pdf")
-    blocks_info = []
+    pages, bboxes, block_types, block_nos, texts = [], [], [], [], []
     for page_num, page in enumerate(doc):
         print(f"Processing page {page_num + 1}/{len(doc)}")
         for block in page.get_text("blocks", flags=fitz.TEXT_DEHYPHENATE):
             if len(block) >= 5 and block[4].strip():
-                blocks_info.append({
-                    'page': page_num,
-                    'text': block[4],
-                    'bbox': block[:4],
-                    'block_type': block[5] if len(block) > 5 else 0,
-                    'block_no': block[6] if len(block) > 6 else 0
-                })
+                pages.append(page_num)
+                bboxes.append(block[:4])
+                texts.append(block[4])
+                block_types.append(block[6] if len(block) > 6 else 0)
+                block_nos.append(block[5] if len(block) > 5 else 0)
     doc.close()
-    print(f"Total text blocks extracted: {len(blocks_info)}")
-    return blocks_info
+    blocks = BlockTable.from_columns(pages, bboxes, block_types, block_nos, texts)
+    print(f"Total text blocks extracted: {len(blocks)}")
+    return blocks
 
 def extract_simple_text(file_bytes: bytes) -> str:
     print("Extracting simple text from PDF...")
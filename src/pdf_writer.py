@@ -1,60 +1,117 @@
+import time
+import functools
 import pymupdf as fitz
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterable, Tuple, Optional
+from src.block_table import BlockTable
 
 DEFAULT_FONT = "helv"
 DEFAULT_FONT_SIZE = 12
 
-def create_translated_pdf(original_bytes: bytes, text_blocks: List[Dict], translated_texts: List[str]) -> bytes:
+# `translated_blocks` carries the original geometry with translated text,
+# see BlockTable.with_texts. With `optimize` the original text is redacted
+# instead of painted over, no "Translated" layer is added, and the output is
+# garbage-collected and compressed; pass a dict as `stats` to receive sizes
+# and timings.
+def create_translated_pdf(original_bytes: bytes, translated_blocks: BlockTable,
+                          optimize: bool = True, linearize: bool = False,
+                          stats: Optional[Dict] = None) -> bytes:
+    pages = (
+        (page_num, translated_blocks.bbox[start:stop].tolist(), translated_blocks.texts(start, stop))
+        for page_num, start, stop in translated_blocks.iter_pages()
+    )
+    return create_translated_pdf_from_pages(original_bytes, pages, optimize, linearize, stats)
+
+# Renders pages as the iterator yields (page_num, bboxes, texts), so a
+# producer can hand over pages while later ones are still translating.
+# `render_seconds` counts only time spent rendering, not waiting for pages.
+def create_translated_pdf_from_pages(original_bytes: bytes, pages: Iterable[Tuple[int, List, List[str]]],
+                                     optimize: bool = True, linearize: bool = False,
+                                     stats: Optional[Dict] = None) -> bytes:
+    render_seconds = 0.0
     doc = fitz.open(stream=original_bytes, filetype="pdf")
-    WHITE = fitz.pdfcolor["white"]
-    ocg = doc.add_ocg("Translated", on=True)
-
-    blocks_by_page = {}
-    for i, block in enumerate(text_blocks):
-        page_num = block['page']
-        if page_num not in blocks_by_page:
-            blocks_by_page[page_num] = []
-        if i < len(translated_texts):
-            blocks_by_page[page_num].append((block, translated_texts[i]))
-
-    for page_num, page_blocks in blocks_by_page.items():
-        page = doc[page_num]
-        for block, translated_text in page_blocks:
-            if translated_text.strip():
-                x0, y0, x1, y1 = block['bbox']
-                # Expand vertical height slightly
-                y1 = y1 + 10  # increase 6 points or more
-                bbox = (x0, y0, x1, y1)
-                page.draw_rect(bbox, color=None, fill=WHITE, oc=ocg)
-                translated_html = translated_text.replace('\n', '<br>')
-                page.insert_htmlbox(
-                    bbox,
-                    translated_html,
-                    css="* {font-family: sans-serif; font-size: 12px;}",
-                    oc=ocg
-                )
-
-    doc.subset_fonts()
-    pdf_bytes = doc.tobytes()
-    doc.close()
+    try:
+        # Hiding the "Translated" layer reveals the original only when it was
+        # painted over; redacted output would show blank holes instead.
+        ocg = 0 if optimize else doc.add_ocg("Translated", on=True)
+
+        for page_num, bboxes, texts in pages:
+            page_start = time.perf_counter()
+            render_translated_page(doc[page_num], bboxes, texts, ocg, optimize)
+            render_seconds += time.perf_counter() - page_start
+
+        page_start = time.perf_counter()
+        doc.subset_fonts()
+        render_seconds += time.perf_counter() - page_start
+        write_start = time.perf_counter()
+        pdf_bytes = save_pdf_bytes(doc, optimize, linearize)
+    finally:
+        doc.close()
+    if stats is not None:
+        stats.update({
+            'input_bytes': len(original_bytes),
+            'output_bytes': len(pdf_bytes),
+            'render_seconds': render_seconds,
+            'write_seconds': time.perf_counter() - write_start,
+        })
     return pdf_bytes
 
-def add_translated_text_to_page(page, text_blocks: List[Dict], translated_texts: List[str]):
-    for i, (block, translated_text) in enumerate(zip(text_blocks, translated_texts)):
-        if not translated_text.strip():
-            continue
-        bbox = fitz.Rect(block['bbox'])
-        font_size = max(8, min(block.get('size', DEFAULT_FONT_SIZE), 24))
-        font = get_font_name(block.get('flags', 0))
-        color = get_text_color(block.get('color', 0))
-        page.insert_text(
-            (bbox.x0, bbox.y0 + font_size),
-            translated_text,
-            fontsize=font_size,
-            fontname=font,
-            color=color
+def render_translated_page(page, bboxes: List[Tuple[float, float, float, float]], texts: List[str],
+                           ocg: int, optimize: bool = True):
+    WHITE = fitz.pdfcolor["white"]
+    page_blocks = [(bbox, text) for bbox, text in zip(bboxes, texts) if text.strip()]
+    if optimize and page_blocks:
+        redact_original_text(page, [bbox for bbox, _ in page_blocks])
+    for (x0, y0, x1, y1), translated_text in page_blocks:
+        # Expand vertical height slightly
+        y1 = y1 + 10  # increase 6 points or more
+        bbox = (x0, y0, x1, y1)
+        if not optimize:
+            page.draw_rect(bbox, color=None, fill=WHITE, oc=ocg)
+        translated_html = translated_text.replace('\n', '<br>')
+        page.insert_htmlbox(
+            bbox,
+            translated_html,
+            css="* {font-family: sans-serif; font-size: 12px;}",
+            oc=ocg
         )
 
+# Removes the original glyphs under each block so the translation is the only
+# text left; images and vector graphics (highlights, tables) are kept.
+def redact_original_text(page, bboxes: List[Tuple[float, float, float, float]]):
+    for bbox in bboxes:
+        page.add_redact_annot(bbox, fill=False)
+    page.apply_redactions(
+        images=fitz.PDF_REDACT_IMAGE_NONE,
+        graphics=fitz.PDF_REDACT_LINE_ART_NONE
+    )
+
+# garbage=4 also merges duplicate objects, so the font and XObject streams
+# embedded by every insert_htmlbox call are stored once.
+def save_pdf_bytes(doc, optimize: bool = True, linearize: bool = False) -> bytes:
+    if not optimize:
+        return doc.tobytes()
+    options = dict(garbage=4, deflate=True, deflate_images=True, deflate_fonts=True, use_objstms=1)
+    if linearize and linearization_supported():
+        try:
+            return doc.tobytes(linear=True, **{k: v for k, v in options.items() if k != 'use_objstms'})
+        except Exception as e:
+            print(f"Linearization failed, saving without it: {e}")
+    return doc.tobytes(**options)
+
+# MuPDF 1.23+ dropped linearisation and rejects linear=True; probe once on a
+# one-page document so the UI only offers the option when it works.
+@functools.lru_cache(maxsize=None)
+def linearization_supported() -> bool:
+    doc = fitz.open()
+    doc.new_page()
+    try:
+        doc.tobytes(linear=True)
+        return True
+    except Exception:
+        return False
+    finally:
+        doc.close()
+
 def add_simple_text_blocks(page, texts: List[str]):
     y_position = 50
     line_height = 16
@@ -87,22 +144,6 @@ def wrap_text(text: str, max_width: float) -> List[str]:
         lines.append(current_line)
     return lines
 
-def get_font_name(flags: int) -> str:
-    if flags & 16:
-        return "helv-boldoblique" if flags & 2 else "helv-bold"
-    elif flags & 2:
-        return "helv-oblique"
-    return "helv"
-
-def get_text_color(color_int: int) -> Tuple[float, float, float]:
-    if color_int == 0:
-        return (0, 0, 0)
-    r = (color_int >> 16) & 255
-    g = (color_int >> 8) & 255
-    b = color_int & 255
-    return (r / 255, g / 255, b / 255)
-
-
 # preserving the original PDF's page size
 def create_simple_translated_pdf(translated_text: str, original_bytes: bytes = None) -> bytes:
     doc = fitz.open()
@@ -135,6 +176,6 @@ def create_simple_translated_pdf(translated_text: str, original_bytes: bytes = N
         else:
             y_position += line_height
 
-    pdf_bytes = doc.tobytes()
+    pdf_bytes = save_pdf_bytes(doc)
     doc.close()
     return pdf_bytes
\ No newline at end of file
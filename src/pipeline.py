@@ -0,0 +1,147 @@
+import queue
+import threading
+import numpy as np
+from typing import Dict, Optional, Tuple
+from src.block_table import BlockTable
+from src.config import PIPELINE_QUEUE_PAGES, PIPELINE_TRANSLATE_WORKERS
+from src.glossary import Glossary, get_glossary
+from src.pdf_writer import create_translated_pdf_from_pages
+from src.translator import translate_text_blocks
+
+# Producer/consumer scheduler: worker threads translate whole pages (network
+# bound) and hand them to the renderer (CPU bound) through a bounded queue,
+# so per-page rendering overlaps translation. A full queue blocks the
+# workers, which bounds the translated pages waiting to be rendered on huge
+# files; translated text for the result table is kept compactly packed.
+#
+# Only per-page rendering can overlap: font subsetting and the final save
+# need every page and always run last. With the default single mBART worker
+# translation dominates, so the gain is at most the per-page render time;
+# on sample_pdfs/Testing.pdf x10 at 50 ms per API call (pipeline_benchmark)
+# that is ~28.5s -> 27.2s with ~3s of rendering, ~0.9s of it subset + save.
+# A render process was tried and gave the same numbers: the translation
+# threads spend their time in network waits, not contending for the GIL.
+#
+# Rendering stays on the calling thread: PyMuPDF documents must not be
+# shared across threads, and Streamlit widgets can only be updated from the
+# script thread, so progress and streamed text are relayed from here too.
+
+_WORKER_DONE = object()
+POLL_SECONDS = 0.1
+
+def _put(q: queue.Queue, item, cancelled: threading.Event):
+    while not cancelled.is_set():
+        try:
+            q.put(item, timeout=POLL_SECONDS)
+            return
+        except queue.Full:
+            continue
+
+def translate_and_render_pdf(original_bytes: bytes, blocks: BlockTable, source: str, target: str,
+                             callback=None, backend: str = 'mbart', stream_callback=None,
+                             glossary: Optional[Glossary] = None, optimize: bool = True,
+                             linearize: bool = False, stats: Optional[dict] = None,
+                             workers: Optional[int] = None,
+                             queue_pages: int = PIPELINE_QUEUE_PAGES) -> Tuple[bytes, BlockTable]:
+    glossary = glossary or get_glossary()
+    page_ranges = list(blocks.iter_pages())
+    workers = workers or PIPELINE_TRANSLATE_WORKERS.get(backend, 1)
+    workers = max(1, min(workers, len(page_ranges)))
+
+    pending_pages: queue.Queue = queue.Queue()
+    for page_range in page_ranges:
+        pending_pages.put(page_range)
+    translated_pages: queue.Queue = queue.Queue(maxsize=queue_pages)
+    cancelled = threading.Event()
+
+    # Written by the workers and relayed by the calling thread: blocks
+    # translated so far per page, and the live LLM output per page in flight
+    # (both keyed by the page's first row).
+    blocks_done: Dict[int, float] = {}
+    partials: Dict[int, str] = {}
+
+    def translate_worker():
+        try:
+            while not cancelled.is_set():
+                try:
+                    page_num, start, stop = pending_pages.get_nowait()
+                except queue.Empty:
+                    break
+
+                def page_progress(p, msg, start=start, count=stop - start):
+                    blocks_done[start] = p * count
+
+                def page_partial(text, start=start):
+                    partials[start] = text
+
+                texts = [t.replace('\n', ' ') for t in blocks.texts(start, stop)]
+                translated = translate_text_blocks(
+                    texts, source, target, callback=page_progress, backend=backend,
+                    stream_callback=page_partial if stream_callback else None, glossary=glossary
+                )
+                blocks_done[start] = stop - start
+                partials.pop(start, None)
+                _put(translated_pages, (page_num, start, stop, translated), cancelled)
+        except Exception as e:
+            _put(translated_pages, e, cancelled)
+        finally:
+            _put(translated_pages, _WORKER_DONE, cancelled)
+
+    # Translated pages are kept UTF-8 packed (keyed by first row) rather than
+    # as one str per block, and stitched into a BlockTable at the end.
+    translated_chunks: Dict[int, Tuple[bytes, np.ndarray]] = {}
+
+    shown = {'progress': None, 'partial': None}
+
+    def relay(rendered: int):
+        if callback:
+            translated_count = int(sum(list(blocks_done.values())))
+            if (translated_count, rendered) != shown['progress']:
+                shown['progress'] = (translated_count, rendered)
+                progress = (translated_count / len(blocks) + rendered / len(page_ranges)) / 2
+                callback(progress, f"Translated block {translated_count} of {len(blocks)}, "
+                                   f"rendered page {rendered} of {len(page_ranges)}")
+        if stream_callback:
+            # Follow the earliest page in flight so parallel workers' streams
+            # don't take turns in the one preview.
+            in_flight = sorted(list(partials))
+            partial = partials.get(in_flight[0]) if in_flight else None
+            if partial is not None and partial is not shown['partial']:
+                shown['partial'] = partial
+                stream_callback(partial)
+
+    def ready_pages():
+        running = workers
+        rendered = 0
+        while running:
+            try:
+                item = translated_pages.get(timeout=POLL_SECONDS)
+            except queue.Empty:
+                relay(rendered)
+                continue
+            if item is _WORKER_DONE:
+                running -= 1
+                continue
+            if isinstance(item, Exception):
+                raise item
+            page_num, start, stop, translated = item
+            translated_chunks[start] = BlockTable.pack_texts(translated)
+            yield page_num, blocks.bbox[start:stop].tolist(), translated
+            rendered += 1
+            relay(rendered)
+
+    threads = [threading.Thread(target=translate_worker, daemon=True) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    completed = False
+    try:
+        pdf_bytes = create_translated_pdf_from_pages(original_bytes, ready_pages(), optimize, linearize, stats)
+        completed = True
+    finally:
+        cancelled.set()
+        # After an error, workers may be mid-page in a slow API call; they are
+        # daemons and stop at their next queue operation, so don't wait on them.
+        for thread in threads:
+            thread.join(timeout=None if completed else POLL_SECONDS)
+    print(f"Pipelined {len(page_ranges)} pages with {workers} translation worker(s)")
+    return pdf_bytes, blocks.with_packed_texts([translated_chunks[start] for _, start, _ in page_ranges])
@@ -1,17 +1,18 @@
 import re
-import json
 import os
 import time
 import requests
+import numpy as np
 from typing import List, Tuple, Optional
 from dotenv import load_dotenv
+from src.llm_translator import translate_segments_llm
+from src.glossary import Glossary, get_glossary, MASK_TOKEN
 
 # ========== Setup ==========
 load_dotenv()
 HF_TOKEN = os.getenv("HF_TOKEN")
 API_URL = "https://api-inference.huggingface.co/models/facebook/mbart-large-50-many-to-many-mmt"
 HEADERS = {"Authorization": f"Bearer {HF_TOKEN}"}
-MODERN_REPLACEMENTS_PATH = "src/modern_replacements.json"
 
 # ========== Language Codes ==========
 MBART_LANG_CODES = {
@@ -28,6 +29,8 @@ ABBREVIATIONS = {
 
 def should_skip_translation(text: str) -> bool:
     text = text.strip()
+    if MASK_TOKEN.fullmatch(text):
+        return True
     if len(text) < 2 and text.lower() != 'a':
         return True
     clean = re.sub(r'[^\w]', '', text).upper()
@@ -65,24 +68,20 @@ def unmask_special_tokens(text: str, replacements: dict) -> str:
     return text
 
 # ========== Modern Fixes ==========
-def load_modern_replacements() -> dict:
-    try:
-        with open(MODERN_REPLACEMENTS_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except Exception as e:
-        print("Could not load modern_replacements.json:", e)
-        return {}
-
-modern_replacements = load_modern_replacements()
-
-def apply_modern_fixes(text: str) -> str:
-    for wrong, right in modern_replacements.items():
-        text = text.replace(wrong, right)
-    return text
+# Substitutions come from src/modern_replacements.json plus any project
+# "<lang>-fixes.json" files, applied in one trie pass (see src/glossary.py).
+def apply_modern_fixes(text: str, target: str = 'hi', glossary: Optional[Glossary] = None) -> str:
+    return (glossary or get_glossary()).apply_fixes(text, target)
 
 # ========== Pre/Postprocessing ==========
+# Glossary placeholders are tokens of their own, so "(__G0__)," yields
+# "(", "__G0__", ")," rather than one word sent to the translator.
+WORD_PATTERN = re.compile(
+    rf'{MASK_TOKEN.pattern}|(?:(?!{MASK_TOKEN.pattern})\S)+|\s+'
+)
+
 def preprocess_text(text: str) -> List[Tuple[str, bool]]:
-    words = re.findall(r'\S+|\s+', text)
+    words = WORD_PATTERN.findall(text)
     segments = []
     current = ""
     current_flag = None
@@ -129,45 +128,142 @@ def translate_text_via_api(text: str, source: str, target: str) -> str:
         print("Translation error:", e)
         return text
 
-def translate_text(text: str, source: str, target: str) -> str:
-    if not text or not text.strip() or source == target:
-        return text
-    masked_text, replacements = mask_special_tokens(text)
+# Translates one segment from preprocess_text. Glossary terms were masked on
+# the whole text beforehand, so only special tokens are masked here.
+def translate_segment(segment: str, source: str, target: str, glossary: Glossary) -> str:
+    masked_text, replacements = mask_special_tokens(segment)
     translated = translate_text_via_api(masked_text.strip(), source, target)
     translated = unmask_special_tokens(translated, replacements)
-    translated = apply_modern_fixes(translated)
-    return translated
+    return glossary.apply_fixes(translated, target)
 
-def translate_text_blocks(text_blocks: List[str], source: str, target: str, callback=None) -> List[str]:
+# Glossary terms are masked on the whole text so multi-word terms survive
+# segmentation; preprocess_text skips the placeholders, so the engine never
+# sees them.
+def translate_text(text: str, source: str, target: str, glossary: Optional[Glossary] = None) -> str:
+    if not text or not text.strip() or source == target:
+        return text
+    glossary = glossary or get_glossary()
+    masked_text, terms = glossary.mask(text, source, target)
+    translated = ""
+    for segment, do_translate in preprocess_text(masked_text):
+        if do_translate:
+            translated_segment = translate_segment(segment, source, target, glossary)
+        else:
+            translated_segment = segment
+        translated += postprocess_translated_text(segment, translated_segment)
+    return glossary.restore(translated, terms)
+
+def translate_text_blocks(text_blocks: List[str], source: str, target: str, callback=None,
+                          backend: str = 'mbart', stream_callback=None,
+                          glossary: Optional[Glossary] = None) -> List[str]:
     if not text_blocks:
         return []
+    glossary = glossary or get_glossary()
+    # Route each block by its own script: blocks already in the target
+    # language are kept as-is, everything else is translated from its
+    # detected language (falling back to the selected source).
+    block_languages = detect_block_languages(text_blocks)
+    if backend == 'llm':
+        return translate_text_blocks_llm(
+            text_blocks, block_languages, source, target, callback, stream_callback, glossary
+        )
     translated = []
     total = len(text_blocks)
+    skipped = 0
     for i, block in enumerate(text_blocks):
         if callback:
             callback((i + 1) / total, f"Translating block {i + 1} of {total}")
-        segments = preprocess_text(block)
-        translated_block = ""
-        for segment, do_translate in segments:
-            if do_translate:
-                translated_segment = translate_text(segment, source, target)
-            else:
-                translated_segment = segment
-            translated_block += postprocess_translated_text(segment, translated_segment)
-        translated.append(translated_block)
+        block_source = block_languages[i] or source
+        if block_source == target:
+            translated.append(block)
+            skipped += 1
+            continue
+        translated.append(translate_text(block, block_source, target, glossary))
         if i < total - 1:
             time.sleep(0.1)
+    print(f"Skipped {skipped}/{total} blocks already in '{target}'")
+    return translated
+
+def translate_text_blocks_llm(text_blocks: List[str], block_languages: List[Optional[str]],
+                              source: str, target: str, callback=None, stream_callback=None,
+                              glossary: Optional[Glossary] = None) -> List[str]:
+    glossary = glossary or get_glossary()
+    # Collect every translatable segment first so segments from many blocks
+    # share one numbered prompt instead of one request each.
+    plans = []
+    pending = {}
+    for i, block in enumerate(text_blocks):
+        block_source = block_languages[i] or source
+        if block_source == target:
+            plans.append(None)
+            continue
+        masked_block, terms = glossary.mask(block, block_source, target)
+        segments = preprocess_text(masked_block)
+        outputs = [segment for segment, _ in segments]
+        for j, (segment, do_translate) in enumerate(segments):
+            if do_translate:
+                masked_text, replacements = mask_special_tokens(segment)
+                pending.setdefault(block_source, []).append((i, j, masked_text.strip(), replacements))
+        plans.append((segments, outputs, terms))
+
+    for block_source, jobs in pending.items():
+        results = translate_segments_llm(
+            [masked for _, _, masked, _ in jobs], block_source, target, callback, stream_callback
+        )
+        for (i, j, _, replacements), result in zip(jobs, results):
+            plans[i][1][j] = glossary.apply_fixes(unmask_special_tokens(result, replacements), target)
+
+    translated = []
+    for block, plan in zip(text_blocks, plans):
+        if plan is None:
+            translated.append(block)
+            continue
+        segments, outputs, terms = plan
+        translated.append(glossary.restore("".join(
+            postprocess_translated_text(segment, output)
+            for (segment, _), output in zip(segments, outputs)
+        ), terms))
+    print(f"Skipped {plans.count(None)}/{len(text_blocks)} blocks already in '{target}'")
     return translated
 
 # ========== Language Detection ==========
+DEVANAGARI_RANGE = (0x0900, 0x097F)
+
+def script_histogram(texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    if not texts:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=len(texts))
+    joined = "".join(texts).encode("utf-32-le", errors="surrogatepass")
+    codes = np.frombuffer(joined, dtype=np.uint32)
+    is_hindi = (codes >= DEVANAGARI_RANGE[0]) & (codes <= DEVANAGARI_RANGE[1])
+    folded = codes | 0x20
+    is_latin = (folded >= ord('a')) & (folded <= ord('z'))
+    # Prefix sums turn per-character masks into per-text counts without
+    # tripping over empty texts (which np.add.reduceat mishandles).
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    hindi_cum = np.concatenate(([0], np.cumsum(is_hindi, dtype=np.int64)))
+    latin_cum = np.concatenate(([0], np.cumsum(is_latin, dtype=np.int64)))
+    return hindi_cum[ends] - hindi_cum[starts], latin_cum[ends] - latin_cum[starts]
+
+def detect_block_languages(texts: List[str]) -> List[Optional[str]]:
+    hindi_counts, latin_counts = script_histogram(texts)
+    return [
+        'hi' if h > l else 'en' if l > 0 else None
+        for h, l in zip(hindi_counts.tolist(), latin_counts.tolist())
+    ]
+
 def detect_language(text: str) -> Optional[str]:
-    sample = text[:500].strip()
-    if not sample:
+    if not text or not text.strip():
         return None
-    hindi_chars = sum(1 for char in sample if '\u0900' <= char <= '\u097F')
-    latin_chars = sum(1 for char in sample if char.isalpha() and char.isascii())
-    if hindi_chars > latin_chars:
-        return 'hi'
-    elif latin_chars > 0:
-        return 'en'
-    return None
+    return detect_block_languages([text])[0]
+
+def detect_translation_direction(texts: List[str], default: Tuple[str, str] = ('en', 'hi')) -> Tuple[str, str]:
+    hindi_counts, latin_counts = script_histogram(texts)
+    hindi_total, latin_total = int(hindi_counts.sum()), int(latin_counts.sum())
+    print(f"Script histogram: {hindi_total} Devanagari, {latin_total} Latin characters")
+    if hindi_total > latin_total:
+        return 'hi', 'en'
+    if latin_total > 0:
+        return 'en', 'hi'
+    return default